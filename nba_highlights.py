@@ -4,33 +4,120 @@ NBA Highlights Reel Creator
 Uses nba_api to get player data and game events, then finds and stitches video highlights.
 """
 
+import asyncio
+import difflib
+import hashlib
 import os
 import sys
 import json
 import re
+import shutil
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+from datetime import timedelta
 from urllib.parse import urljoin, quote
-import requests
-from bs4 import BeautifulSoup
-import yt_dlp
+import httpx
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random
+)
+
+# Heavy imports (nba_api endpoints/pandas, requests_cache, yt_dlp, bs4) are deferred
+# to first use so the CLI starts quickly
 
 try:
-    from nba_api.stats.endpoints import (
-        playergamelog, 
-        playbyplayv2, 
-        commonplayerinfo,
-        scoreboardv2
-    )
     from nba_api.stats.static import players
-    from nba_api.live.nba.endpoints import scoreboard
+    from nba_api.stats.library.http import NBAStatsHTTP
     NBA_API_AVAILABLE = True
 except ImportError:
     NBA_API_AVAILABLE = False
     print("Warning: nba_api not installed. Install with: pip install nba_api")
 
+import requests
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Link/embed filters used by the search-page scraper
+_KEYWORDS = frozenset(('video', 'highlight', 'play', 'watch'))
+_VIDEO_DOMAINS = ('nba.com', 'youtube', 'vimeo')
+
+# Characters stripped from player names when building output filenames
+_SAFE_NAME_RE = re.compile(r'[^\w\s-]')
+
+# Only build DOM nodes for the tags the search-page scraper looks at
+_SEARCH_TAGS = ['a', 'video', 'iframe']
+_SEARCH_SELECTOR = 'a[href], video, iframe'
+
+# Cache nba_api responses on disk so repeated runs skip the stats.nba.com round-trips.
+# Kept in the user cache directory so runs from any working directory share it.
+NBA_API_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'nbahighlights'
+NBA_API_CACHE_NAME = NBA_API_CACHE_DIR / 'nba_cache'
+NBA_API_CACHE_EXPIRY = timedelta(hours=6)
+_nba_api_cache_installed = False
+
+
+def _install_nba_api_cache():
+    """Route nba_api requests through an on-disk requests_cache session (once)."""
+    global _nba_api_cache_installed
+    if not _nba_api_cache_installed:
+        import requests_cache
+        NBA_API_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        NBAStatsHTTP.set_session(
+            requests_cache.CachedSession(str(NBA_API_CACHE_NAME), expire_after=NBA_API_CACHE_EXPIRY)
+        )
+        _nba_api_cache_installed = True
+
+
+# stats.nba.com rate-limits bursts, so space out endpoint calls
+NBA_API_MIN_INTERVAL = 0.6  # seconds
+_last_nba_api_call = 0.0
+
+
+def _throttle_nba_api():
+    """Sleep until at least NBA_API_MIN_INTERVAL has passed since the last nba_api call."""
+    global _last_nba_api_call
+    delay = _last_nba_api_call + NBA_API_MIN_INTERVAL - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    _last_nba_api_call = time.monotonic()
+
+
+def _reset_nba_api_connections(retry_state=None):
+    """Close pooled stats.nba.com sockets, which can stay stuck after a timeout."""
+    for adapter in NBAStatsHTTP.get_session().adapters.values():
+        adapter.close()
+
+
+def _iter_search_tags(content: bytes):
+    """
+    Yield (tag name, attributes, text) for search-page links and players, in page order.
+    
+    Uses selectolax when installed and falls back to BeautifulSoup. Text is
+    only extracted for links.
+    """
+    if SELECTOLAX_AVAILABLE:
+        for node in LexborHTMLParser(content).css(_SEARCH_SELECTOR):
+            text = node.text(strip=True) if node.tag == 'a' else ''
+            yield node.tag, node.attributes, text
+    else:
+        from bs4 import BeautifulSoup, SoupStrainer
+        soup = BeautifulSoup(content, 'lxml', parse_only=SoupStrainer(_SEARCH_TAGS))
+        for tag in soup.find_all(_SEARCH_TAGS):
+            text = tag.get_text(strip=True) if tag.name == 'a' else ''
+            yield tag.name, tag.attrs, text
+
 
 class NBAHighlightsFinder:
     """Finds player highlights using nba_api and video search."""
@@ -41,27 +128,96 @@ class NBAHighlightsFinder:
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
     }
+    REQUEST_TIMEOUT = 10
+    MAX_CONCURRENT_REQUESTS = 8  # Keep NBA.com from rate-limiting us
+    
+    # Lowercased name -> (player_id, full_name), shared by every finder instance
+    _NAME_INDEX = None
+    _LAST_NAME_INDEX = None
+    _ID_INDEX = None  # player_id -> full_name
     
     def __init__(self, player_name: str):
         self.player_name = player_name
         self.player_id = None
-        self.session = requests.Session()
-        self.session.headers.update(self.HEADERS)
         self.highlights = []
         
+        # One event loop and HTTP/2 client for the whole run, so scraping
+        # keeps its keep-alive connections between searches and page lookups
+        self._loop = None
+        self._client = None
+        
         if NBA_API_AVAILABLE:
+            _install_nba_api_cache()
             self._find_player_id()
     
+    @classmethod
+    def _build_name_index(cls):
+        """Index the static nba_api player list by full name, last name and ID."""
+        name_index = {}
+        last_name_index = {}
+        id_index = {}
+        # Active players first, then by ID (longest-tenured first), so shared
+        # names resolve the same way every run to someone playing now
+        all_players = sorted(players.get_players(),
+                             key=lambda player: (not player['is_active'], player['id']))
+        for player in all_players:
+            full_name = f"{player['first_name']} {player['last_name']}"
+            entry = (player['id'], full_name)
+            name_index.setdefault(full_name.lower(), entry)
+            last_name_index.setdefault(player['last_name'].lower(), entry)
+            id_index[player['id']] = full_name
+        cls._NAME_INDEX = name_index
+        cls._LAST_NAME_INDEX = last_name_index
+        cls._ID_INDEX = id_index
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _match_player(cls, name: str) -> Optional[tuple]:
+        """Return (player_id, full_name) for a lowercased player name."""
+        if cls._NAME_INDEX is None:
+            cls._build_name_index()
+        
+        match = cls._NAME_INDEX.get(name) or cls._LAST_NAME_INDEX.get(name)
+        if match:
+            return match
+        
+        # One pass for partial names: a first-name match beats a prefix match,
+        # which beats the name appearing anywhere (or the query containing it)
+        first_name_match = prefix_match = contained_match = None
+        for full_name, entry in cls._NAME_INDEX.items():
+            if full_name.startswith(name):
+                if full_name.startswith(name + ' '):
+                    first_name_match = entry
+                    break
+                prefix_match = prefix_match or entry
+            elif name in full_name or full_name in name:
+                contained_match = contained_match or entry
+        match = first_name_match or prefix_match or contained_match
+        if match:
+            return match
+        
+        # Fall back to fuzzy matching for misspelled names
+        close = difflib.get_close_matches(name, cls._NAME_INDEX.keys(), n=1, cutoff=0.7)
+        return cls._NAME_INDEX[close[0]] if close else None
+    
     def _find_player_id(self) -> Optional[str]:
         """Find player ID from nba_api."""
         try:
-            all_players = players.get_players()
-            for player in all_players:
-                full_name = f"{player['first_name']} {player['last_name']}"
-                if self.player_name.lower() in full_name.lower() or full_name.lower() in self.player_name.lower():
-                    self.player_id = player['id']
-                    print(f"Found player: {full_name} (ID: {self.player_id})")
-                    return self.player_id
+            if self.player_name.strip().isdigit():
+                # Already a player ID: skip name matching
+                self.player_id = int(self.player_name)
+                if self._NAME_INDEX is None:
+                    self._build_name_index()
+                # Search NBA.com by the player's name rather than the number
+                self.player_name = self._ID_INDEX.get(self.player_id, self.player_name.strip())
+                print(f"Using player ID: {self.player_id} ({self.player_name})")
+                return self.player_id
+            
+            match = self._match_player(self.player_name.strip().lower())
+            if match:
+                self.player_id, full_name = match
+                print(f"Found player: {full_name} (ID: {self.player_id})")
+                return self.player_id
             
             print(f"Warning: Could not find player ID for '{self.player_name}'")
             return None
@@ -69,6 +225,28 @@ class NBAHighlightsFinder:
             print(f"Error finding player ID: {e}")
             return None
     
+    @staticmethod
+    @lru_cache(maxsize=128)
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30) + wait_random(0, 2),
+        retry=retry_if_exception_type(requests.exceptions.Timeout),
+        before_sleep=_reset_nba_api_connections,
+        reraise=True
+    )
+    def _fetch_game_log(player_id: int, season: str, season_type: str) -> tuple:
+        """Fetch a player's game log rows, once per process for each season/type."""
+        from nba_api.stats.endpoints import playergamelog
+        
+        _throttle_nba_api()
+        game_log = playergamelog.PlayerGameLog(
+            player_id=player_id,
+            season=season,
+            season_type_all_star=season_type
+        )
+        # Tuple so the cached rows can't be appended to by callers
+        return tuple(game_log.get_normalized_dict()['PlayerGameLog'])
+    
     def get_recent_games(self, days_back: int = 30, max_games: int = 10) -> List[Dict]:
         """
         Get recent games for the player using nba_api.
@@ -85,17 +263,15 @@ class NBAHighlightsFinder:
         
         try:
             # Get player game log
-            game_log = playergamelog.PlayerGameLog(
-                player_id=self.player_id,
-                season='2024-25',  # Current season - may need adjustment
-                season_type_all_star='Regular Season'
+            rows = self._fetch_game_log(
+                self.player_id,
+                '2024-25',  # Current season - may need adjustment
+                'Regular Season'
             )
             
-            games_df = game_log.get_data_frames()[0]
-            
             # Get recent games
             recent_games = []
-            for idx, row in games_df.head(max_games).iterrows():
+            for row in rows[:max_games]:
                 game_date = row['GAME_DATE']
                 game_id = row['MATCHUP'].split(' ')[-1]  # Extract game ID if available
                 
@@ -114,13 +290,9 @@ class NBAHighlightsFinder:
             print(f"Error getting recent games: {e}")
             # Try without specifying season
             try:
-                game_log = playergamelog.PlayerGameLog(
-                    player_id=self.player_id,
-                    season='2023-24'
-                )
-                games_df = game_log.get_data_frames()[0]
+                rows = self._fetch_game_log(self.player_id, '2023-24', 'Regular Season')
                 recent_games = []
-                for idx, row in games_df.head(max_games).iterrows():
+                for row in rows[:max_games]:
                     recent_games.append({
                         'game_id': '',
                         'date': row['GAME_DATE'],
@@ -180,7 +352,7 @@ class NBAHighlightsFinder:
         """
         print(f"Searching for highlights of {self.player_name}...")
         
-        video_links = []
+        search_urls = []
         
         # Method 1: Use nba_api to get recent games, then search for videos
         if NBA_API_AVAILABLE and self.player_id:
@@ -194,78 +366,134 @@ class NBAHighlightsFinder:
                     f"{self.player_name} {game['date']}",
                     f"{self.player_name} {game['pts']} points"
                 ]
-                
-                for term in search_terms:
-                    video_urls = self._search_nba_videos(term)
-                    video_links.extend(video_urls)
-                    if len(video_links) >= max_results:
-                        break
-                
-                if len(video_links) >= max_results:
-                    break
+                search_urls.extend(self._search_url(term) for term in search_terms)
         
         # Method 2: Direct search on NBA.com
-        if len(video_links) < max_results:
-            search_url = f"{self.BASE_URL}/search?q={quote(self.player_name + ' highlights')}"
-            additional_videos = self._search_nba_videos_from_url(search_url)
-            video_links.extend(additional_videos)
+        search_urls.append(self._search_url(self.player_name + ' highlights'))
         
-        # Remove duplicates and limit
-        seen_urls = set()
-        unique_links = []
-        for link in video_links:
-            if link['url'] not in seen_urls:
-                seen_urls.add(link['url'])
-                unique_links.append(link)
-                if len(unique_links) >= max_results:
-                    break
+        # Different games often produce the same query; fetch each URL once, in order
+        search_urls = list(dict.fromkeys(search_urls))
+        unique_links = self._run(self._asearch_nba_videos(search_urls, max_results))
         
         self.highlights = unique_links
         print(f"Found {len(self.highlights)} unique highlights")
         return self.highlights
     
-    def _search_nba_videos(self, search_term: str) -> List[Dict]:
-        """Search NBA.com for videos matching search term."""
-        search_url = f"{self.BASE_URL}/search?q={quote(search_term)}"
-        return self._search_nba_videos_from_url(search_url)
+    def _search_url(self, search_term: str) -> str:
+        """Build the NBA.com search URL for a search term."""
+        return f"{self.BASE_URL}/search?q={quote(search_term)}"
+    
+    def _run(self, coro):
+        """Run a coroutine on the finder's event loop, which owns the shared client."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    def _http_client(self) -> httpx.AsyncClient:
+        """Return the shared pooled HTTP/2 client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers=self.HEADERS,
+                timeout=self.REQUEST_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40)
+            )
+        return self._client
+    
+    def close(self):
+        """Close the shared HTTP client and its event loop."""
+        if self._loop is None:
+            return
+        if self._client is not None:
+            self._loop.run_until_complete(self._client.aclose())
+            self._client = None
+        self._loop.close()
+        self._loop = None
+    
+    async def _afetch(self, client: httpx.AsyncClient,
+                      semaphore: asyncio.Semaphore, url: str) -> Optional[bytes]:
+        """Fetch a page body, or None if the request failed."""
+        async with semaphore:
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                return response.content
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                print(f"Error fetching {url}: {e}")
+                return None
+    
+    async def _asearch_nba_videos(self, urls: List[str], max_results: int) -> List[Dict]:
+        """
+        Search several NBA.com pages concurrently.
+        
+        Up to MAX_CONCURRENT_REQUESTS searches run at once. Results are taken in
+        search order, and searches still pending once max_results unique links
+        are found are cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        client = self._http_client()
+        tasks = [
+            asyncio.ensure_future(self._asearch_nba_videos_from_url(client, semaphore, url))
+            for url in urls
+        ]
+        seen_urls = set()
+        unique_links = []
+        
+        try:
+            # Remove duplicates and limit, keeping search order
+            for task in tasks:
+                for link in await task:
+                    if link['url'] not in seen_urls:
+                        seen_urls.add(link['url'])
+                        unique_links.append(link)
+                        if len(unique_links) >= max_results:
+                            return unique_links
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return unique_links
     
-    def _search_nba_videos_from_url(self, url: str) -> List[Dict]:
+    async def _asearch_nba_videos_from_url(self, client: httpx.AsyncClient,
+                                           semaphore: asyncio.Semaphore,
+                                           url: str) -> List[Dict]:
         """Extract video links from NBA.com search page."""
+        content = await self._afetch(client, semaphore, url)
+        if content is None:
+            return []
+        
         video_links = []
+        player_name_lower = self.player_name.lower()
         
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for video/article links
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
+        for name, attrs, text in _iter_search_tags(content):
+            if name == 'a':
+                # Look for video/article links
+                href = attrs.get('href') or ''
+                if not href:
+                    continue
+                href_lower = href.lower()
                 
                 # Check if it's a video/highlight link
-                if any(keyword in href.lower() for keyword in ['video', 'highlight', 'play', 'watch']):
-                    if self.player_name.lower() in text.lower() or 'highlight' in text.lower():
+                if any(keyword in href_lower for keyword in _KEYWORDS):
+                    text_lower = text.lower()
+                    if player_name_lower in text_lower or 'highlight' in text_lower:
                         full_url = urljoin(self.BASE_URL, href)
                         video_links.append({
                             'url': full_url,
                             'title': text,
                             'description': ''
                         })
-            
-            # Look for embedded video players
-            for player in soup.find_all(['video', 'iframe']):
-                src = player.get('src', '') or player.get('data-src', '')
-                if src and any(domain in src for domain in ['nba.com', 'youtube', 'vimeo']):
+            else:
+                # Look for embedded video players
+                src = attrs.get('src') or attrs.get('data-src') or ''
+                if src and any(domain in src for domain in _VIDEO_DOMAINS):
                     video_links.append({
                         'url': src,
                         'title': f"{self.player_name} Highlight",
                         'description': ''
                     })
-            
-        except requests.RequestException as e:
-            print(f"Error searching NBA.com: {e}")
         
         return video_links
     
@@ -279,44 +507,80 @@ class NBAHighlightsFinder:
         Returns:
             List of video URLs
         """
-        try:
-            response = self.session.get(page_url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            video_urls = []
-            
-            # Look for video sources
-            for video_tag in soup.find_all('video'):
-                sources = video_tag.find_all('source')
-                for source in sources:
-                    src = source.get('src', '')
-                    if src:
-                        video_urls.append(urljoin(page_url, src))
-            
-            # Look for iframe embeds
-            for iframe in soup.find_all('iframe'):
-                src = iframe.get('src', '')
-                if src:
-                    video_urls.append(src)
-            
-            # Look for data attributes that might contain video URLs
-            for element in soup.find_all(attrs={'data-video-url': True}):
-                video_urls.append(element['data-video-url'])
-            
-            return video_urls
+        return self.get_video_urls_from_pages([page_url])[0]
+    
+    def get_video_urls_from_pages(self, page_urls: List[str]) -> List[List[str]]:
+        """
+        Extract video URLs from several NBA.com pages concurrently.
+        
+        Args:
+            page_urls: URLs of pages containing highlights
             
-        except requests.RequestException as e:
-            print(f"Error fetching page {page_url}: {e}")
+        Returns:
+            List of video URLs for each page, in the same order as page_urls
+        """
+        if not page_urls:
+            return []
+        return self._run(self._aget_video_urls_from_pages(page_urls))
+    
+    async def _aget_video_urls_from_pages(self, page_urls: List[str]) -> List[List[str]]:
+        """Fetch and parse every page on the shared HTTP client."""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        client = self._http_client()
+        return await asyncio.gather(
+            *[self._aget_video_urls_from_page(client, semaphore, url) for url in page_urls]
+        )
+    
+    async def _aget_video_urls_from_page(self, client: httpx.AsyncClient,
+                                         semaphore: asyncio.Semaphore,
+                                         page_url: str) -> List[str]:
+        """Extract video URLs from one page fetched on a shared client."""
+        content = await self._afetch(client, semaphore, page_url)
+        if content is None:
             return []
+        
+        if SELECTOLAX_AVAILABLE:
+            tree = LexborHTMLParser(content)
+            sources = [node.attributes.get('src') for node in tree.css('video source[src]')]
+            iframes = [node.attributes.get('src') for node in tree.css('iframe[src]')]
+            data_urls = [node.attributes.get('data-video-url') for node in tree.css('[data-video-url]')]
+        else:
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(content, 'lxml')
+            sources = [source.get('src') for video_tag in soup.find_all('video')
+                       for source in video_tag.find_all('source')]
+            iframes = [iframe.get('src') for iframe in soup.find_all('iframe')]
+            data_urls = [element['data-video-url']
+                         for element in soup.find_all(attrs={'data-video-url': True})]
+        
+        # Video sources first, then iframe embeds, then data attributes
+        video_urls = [urljoin(page_url, src) for src in sources if src]
+        video_urls.extend(src for src in iframes if src)
+        video_urls.extend(url for url in data_urls if url)
+        
+        return video_urls
 
 
 class VideoDownloader:
     """Downloads videos from URLs."""
     
+    # HLS/DASH segments fetched in parallel per video (NBA.com clips are mostly HLS)
+    CONCURRENT_FRAGMENTS = 8
+    
     def __init__(self, output_dir: str = "downloads"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self._finished = None  # filename stem -> finished download, scanned once
+    
+    def _find_download(self, stem: str) -> Optional[Path]:
+        """Return the finished download for a filename stem, whatever extension yt-dlp chose."""
+        if self._finished is None:
+            # .part/.ytdl leftovers have stems like "video_x.mp4", so they never match
+            self._finished = {
+                path.stem: path for path in self.output_dir.iterdir()
+                if path.is_file() and path.stat().st_size > 0
+            }
+        return self._finished.get(stem)
     
     def download_video(self, url: str, filename: Optional[str] = None) -> Optional[str]:
         """
@@ -329,50 +593,191 @@ class VideoDownloader:
         Returns:
             Path to downloaded video file, or None if download failed
         """
-        if filename is None:
-            filename = f"video_{hash(url) % 10000}.mp4"
+        # Name default downloads after the URL so reruns can reuse them
+        cached = filename is None
+        if cached:
+            filename = f"video_{hashlib.blake2b(url.encode(), digest_size=8).hexdigest()}.mp4"
         
         output_path = self.output_dir / filename
+        if cached:
+            existing = self._find_download(output_path.stem)
+            if existing:
+                print(f"Already downloaded: {existing}")
+                return str(existing)
+        
+        # Record the final filename yt-dlp writes (it may add its own extension)
+        filenames = []
+        
+        def record_filename(d):
+            if d.get('status') == 'finished':
+                filenames.append(d['filename'])
         
         ydl_opts = {
             'format': 'best[ext=mp4]/best',
-            'outtmpl': str(output_path.with_suffix('')),
+            'outtmpl': str(output_path.with_suffix('')) + '.%(ext)s',
             'quiet': False,
             'no_warnings': False,
+            'concurrent_fragment_downloads': self.CONCURRENT_FRAGMENTS,
+            'progress_hooks': [record_filename],
         }
         
         try:
+            import yt_dlp  # Deferred: slow to import and only needed for downloads
+            
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
-                
-            # Find the actual downloaded file (yt-dlp may add extension)
-            downloaded_files = list(self.output_dir.glob(f"{output_path.stem}*"))
-            if downloaded_files:
-                return str(downloaded_files[0])
             
-            return None
+            if not filenames:
+                return None
+            
+            if self._finished is not None:
+                self._finished[Path(filenames[-1]).stem] = Path(filenames[-1])
+            return filenames[-1]
             
         except Exception as e:
             print(f"Error downloading video from {url}: {e}")
             return None
+    
+    def download_videos(self, urls: List[str], filenames: List[Optional[str]],
+                        max_workers: int = 6) -> List[Optional[str]]:
+        """
+        Download several videos concurrently.
+        
+        Each task gets its own yt-dlp instance, since YoutubeDL objects are
+        not safe to share between threads.
+        
+        Args:
+            urls: Video URLs
+            filenames: Output filename for each URL (None for the default)
+            max_workers: Maximum number of simultaneous downloads
+            
+        Returns:
+            Downloaded file paths in the same order as urls (None for failures)
+        """
+        if not urls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.download_video, urls, filenames))
 
 
 class VideoStitcher:
     """Stitches multiple videos together into a highlight reel."""
     
+    FFMPEG_STDERR_TAIL = 50  # Lines of ffmpeg output kept for error messages
+    
+    # H.264 encoders in order of preference (hardware first) and their quality settings
+    VIDEO_ENCODER_ARGS = {
+        'h264_nvenc': ['-preset', 'p4', '-rc', 'vbr', '-cq', '23'],
+        'h264_videotoolbox': ['-b:v', '8M'],
+        'h264_qsv': ['-global_quality', '23'],
+        'libx264': ['-preset', 'veryfast', '-crf', '23', '-threads', '0'],
+    }
+    
+    # ffmpeg availability and encoder choice, probed once per process
+    _ffmpeg_ok = None
+    _video_encoder = None
+    
+    # Video stream properties that must match across clips for a concat stream copy
+    PROBE_FIELDS = ('codec_name', 'width', 'height', 'pix_fmt', 'r_frame_rate')
+    MAX_PROBE_WORKERS = 16
+    
     def __init__(self, output_dir: str = "output"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self._probe_cache = {}  # (path, mtime, size) -> video stream info
     
-    def check_ffmpeg(self) -> bool:
-        """Check if ffmpeg is installed."""
-        try:
-            subprocess.run(['ffmpeg', '-version'], 
-                         capture_output=True, 
-                         check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+    @classmethod
+    def check_ffmpeg(cls) -> bool:
+        """Check if ffmpeg is installed (looked up on PATH once per process)."""
+        if cls._ffmpeg_ok is None:
+            cls._ffmpeg_ok = shutil.which('ffmpeg') is not None
+        return cls._ffmpeg_ok
+    
+    @staticmethod
+    def _encoder_works(encoder: str) -> bool:
+        """Check that ffmpeg can encode a test frame with the given encoder."""
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+            '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'
+        ]
+        return subprocess.run(cmd, capture_output=True).returncode == 0
+    
+    @classmethod
+    def _detect_hw_encoder(cls) -> str:
+        """Pick the fastest H.264 encoder that actually works on this machine."""
+        if cls._video_encoder is None:
+            cls._video_encoder = 'libx264'
+            encoders = ''
+            if cls.check_ffmpeg():
+                encoders = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                          capture_output=True, text=True).stdout
+            
+            for encoder in cls.VIDEO_ENCODER_ARGS:
+                # Listed encoders may still lack the GPU/driver, so try a one-frame encode
+                if encoder in encoders and cls._encoder_works(encoder):
+                    cls._video_encoder = encoder
+                    break
+        return cls._video_encoder
+    
+    def _probe_file(self, path: str) -> Optional[Dict]:
+        """Return the first video stream's properties via ffprobe, or None."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+        if key not in self._probe_cache:
+            cmd = [
+                'ffprobe',
+                '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'stream=' + ','.join(self.PROBE_FIELDS),
+                '-print_format', 'json',
+                path
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                streams = json.loads(result.stdout).get('streams') if result.returncode == 0 else None
+            except (FileNotFoundError, ValueError):
+                streams = None
+            self._probe_cache[key] = streams[0] if streams else None
+        return self._probe_cache[key]
+    
+    def _probe(self, paths: List[str]) -> List[Optional[Dict]]:
+        """Probe several videos in parallel."""
+        with ThreadPoolExecutor(max_workers=min(len(paths), self.MAX_PROBE_WORKERS)) as executor:
+            return list(executor.map(self._probe_file, paths))
+    
+    def _can_stream_copy(self, paths: List[str]) -> bool:
+        """Check whether all clips share codec, size, pixel format and frame rate."""
+        probes = self._probe(paths)
+        if not all(probes):
             return False
+        return all(probe == probes[0] for probe in probes[1:])
+    
+    def _run_ffmpeg(self, cmd: List[str], input_text: Optional[str] = None) -> Tuple[int, str]:
+        """
+        Run an ffmpeg command, streaming its stderr instead of buffering it.
+        
+        Only the last FFMPEG_STDERR_TAIL lines are kept for error reporting.
+        
+        Args:
+            cmd: ffmpeg command line
+            input_text: Optional text written to ffmpeg's stdin
+            
+        Returns:
+            Tuple of (return code, tail of ffmpeg's stderr)
+        """
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                                stdin=subprocess.PIPE if input_text is not None else None,
+                                stderr=subprocess.PIPE, text=True, errors='replace')
+        if input_text is not None:
+            # The concat list is small and read up front, so this can't fill the pipe
+            proc.stdin.write(input_text)
+            proc.stdin.close()
+        last_lines = deque(maxlen=self.FFMPEG_STDERR_TAIL)
+        for line in proc.stderr:
+            last_lines.append(line)
+        return proc.wait(), ''.join(last_lines)
     
     def stitch_videos(self, video_paths: List[str], output_filename: str, 
                      transition_duration: float = 0.5) -> Optional[str]:
@@ -405,62 +810,68 @@ class VideoStitcher:
         
         output_path = self.output_dir / output_filename
         
-        # Create a file list for ffmpeg concat
-        concat_file = self.output_dir / "concat_list.txt"
-        with open(concat_file, 'w') as f:
-            for video_path in video_paths:
-                f.write(f"file '{os.path.abspath(video_path)}'\n")
+        # File list for the ffmpeg concat demuxer, piped in on stdin. Entries need
+        # an explicit file: scheme or ffmpeg resolves them relative to pipe:
+        concat_text = ''.join(f"file 'file:{os.path.abspath(video_path)}'\n" for video_path in video_paths)
         
         try:
+            # Probe first so mismatched clips go straight to re-encoding
+            if not self._can_stream_copy(video_paths):
+                print("Clips have different video formats, re-encoding...")
+                return self._stitch_with_reencode(video_paths, output_path, concat_text)
+            
             # Use ffmpeg to concatenate videos
             cmd = [
                 'ffmpeg',
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', str(concat_file),
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0',
                 '-c', 'copy',  # Copy codec (fast, no re-encoding)
                 '-y',  # Overwrite output file
                 str(output_path)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, stderr_tail = self._run_ffmpeg(cmd, input_text=concat_text)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"Successfully created highlight reel: {output_path}")
-                concat_file.unlink()  # Clean up
                 return str(output_path)
             else:
-                print(f"Error stitching videos: {result.stderr}")
+                print(f"Error stitching videos: {stderr_tail}")
                 # Try with re-encoding if copy fails
-                return self._stitch_with_reencode(video_paths, output_path, concat_file)
+                return self._stitch_with_reencode(video_paths, output_path, concat_text)
                 
         except Exception as e:
             print(f"Error during video stitching: {e}")
             return None
     
     def _stitch_with_reencode(self, video_paths: List[str], output_path: Path, 
-                              concat_file: Path) -> Optional[str]:
+                              concat_text: str) -> Optional[str]:
         """Fallback method with re-encoding."""
         try:
+            encoder = self._detect_hw_encoder()
+            print(f"Re-encoding with {encoder}...")
             cmd = [
                 'ffmpeg',
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', str(concat_file),
-                '-c:v', 'libx264',
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0',
+                '-c:v', encoder,
+                *self.VIDEO_ENCODER_ARGS[encoder],
                 '-c:a', 'aac',
                 '-y',
                 str(output_path)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, stderr_tail = self._run_ffmpeg(cmd, input_text=concat_text)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"Successfully created highlight reel (with re-encoding): {output_path}")
-                concat_file.unlink()
                 return str(output_path)
             else:
-                print(f"Error stitching videos with re-encoding: {result.stderr}")
+                print(f"Error stitching videos with re-encoding: {stderr_tail}")
                 return None
                 
         except Exception as e:
@@ -497,29 +908,33 @@ def main():
     
     # Step 2: Download videos
     downloader = VideoDownloader()
-    downloaded_videos = []
+    video_urls = []
+    filenames = []
     
     print(f"\nDownloading {len(highlights)} videos...")
+    
+    # Resolve the actual video URL behind every NBA.com page in one concurrent pass
+    page_urls = [h.get('url', '') for h in highlights if 'nba.com' in h.get('url', '')]
+    resolved = dict(zip(page_urls, finder.get_video_urls_from_pages(page_urls)))
+    finder.close()
+    
     for i, highlight in enumerate(highlights, 1):
-        print(f"Downloading {i}/{len(highlights)}: {highlight.get('title', 'Untitled')}")
         video_url = highlight.get('url', '')
         
         if not video_url:
             continue
         
         # Try to get actual video URL from the page
-        if 'nba.com' in video_url:
-            actual_urls = finder.get_video_urls_from_page(video_url)
-            if actual_urls:
-                video_url = actual_urls[0]
-        
-        video_path = downloader.download_video(
-            video_url, 
-            filename=f"highlight_{i:03d}.mp4"
-        )
+        actual_urls = resolved.get(video_url)
+        if actual_urls:
+            video_url = actual_urls[0]
         
-        if video_path:
-            downloaded_videos.append(video_path)
+        print(f"Queued {i}/{len(highlights)}: {highlight.get('title', 'Untitled')}")
+        video_urls.append(video_url)
+        filenames.append(f"highlight_{i:03d}.mp4")
+    
+    results = downloader.download_videos(video_urls, filenames)
+    downloaded_videos = [path for path in results if path]
     
     if not downloaded_videos:
         print("\nNo videos were successfully downloaded.")
@@ -534,7 +949,7 @@ def main():
     print(f"\nStitching {len(downloaded_videos)} videos together...")
     stitcher = VideoStitcher()
     
-    safe_player_name = re.sub(r'[^\w\s-]', '', player_name).strip().replace(' ', '_')
+    safe_player_name = _SAFE_NAME_RE.sub('', player_name).strip().replace(' ', '_')
     output_filename = f"{safe_player_name}_highlight_reel.mp4"
     
     final_video = stitcher.stitch_videos(downloaded_videos, output_filename)
@@ -4,30 +4,135 @@ Simple video stitcher for manually provided video files or URLs.
 Use this if the automatic scraper doesn't work with NBA.com.
 """
 
+import hashlib
 import os
 import sys
+import json
+import shutil
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
-import yt_dlp
+from typing import List, Dict, Optional, Tuple
 
 
 class VideoStitcher:
     """Stitches multiple videos together into a highlight reel."""
     
+    FFMPEG_STDERR_TAIL = 50  # Lines of ffmpeg output kept for error messages
+    
+    # H.264 encoders in order of preference (hardware first) and their quality settings
+    VIDEO_ENCODER_ARGS = {
+        'h264_nvenc': ['-preset', 'p4', '-rc', 'vbr', '-cq', '23'],
+        'h264_videotoolbox': ['-b:v', '8M'],
+        'h264_qsv': ['-global_quality', '23'],
+        'libx264': ['-preset', 'veryfast', '-crf', '23', '-threads', '0'],
+    }
+    
+    # ffmpeg availability and encoder choice, probed once per process
+    _ffmpeg_ok = None
+    _video_encoder = None
+    
+    # Video stream properties that must match across clips for a concat stream copy
+    PROBE_FIELDS = ('codec_name', 'width', 'height', 'pix_fmt', 'r_frame_rate')
+    MAX_PROBE_WORKERS = 16
+    
     def __init__(self, output_dir: str = "output"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self._probe_cache = {}  # (path, mtime, size) -> video stream info
     
-    def check_ffmpeg(self) -> bool:
-        """Check if ffmpeg is installed."""
-        try:
-            subprocess.run(['ffmpeg', '-version'], 
-                         capture_output=True, 
-                         check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+    @classmethod
+    def check_ffmpeg(cls) -> bool:
+        """Check if ffmpeg is installed (looked up on PATH once per process)."""
+        if cls._ffmpeg_ok is None:
+            cls._ffmpeg_ok = shutil.which('ffmpeg') is not None
+        return cls._ffmpeg_ok
+    
+    @staticmethod
+    def _encoder_works(encoder: str) -> bool:
+        """Check that ffmpeg can encode a test frame with the given encoder."""
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+            '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'
+        ]
+        return subprocess.run(cmd, capture_output=True).returncode == 0
+    
+    @classmethod
+    def _detect_hw_encoder(cls) -> str:
+        """Pick the fastest H.264 encoder that actually works on this machine."""
+        if cls._video_encoder is None:
+            cls._video_encoder = 'libx264'
+            encoders = ''
+            if cls.check_ffmpeg():
+                encoders = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                          capture_output=True, text=True).stdout
+            
+            for encoder in cls.VIDEO_ENCODER_ARGS:
+                # Listed encoders may still lack the GPU/driver, so try a one-frame encode
+                if encoder in encoders and cls._encoder_works(encoder):
+                    cls._video_encoder = encoder
+                    break
+        return cls._video_encoder
+    
+    def _probe_file(self, path: str) -> Optional[Dict]:
+        """Return the first video stream's properties via ffprobe, or None."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+        if key not in self._probe_cache:
+            cmd = [
+                'ffprobe',
+                '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'stream=' + ','.join(self.PROBE_FIELDS),
+                '-print_format', 'json',
+                path
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                streams = json.loads(result.stdout).get('streams') if result.returncode == 0 else None
+            except (FileNotFoundError, ValueError):
+                streams = None
+            self._probe_cache[key] = streams[0] if streams else None
+        return self._probe_cache[key]
+    
+    def _probe(self, paths: List[str]) -> List[Optional[Dict]]:
+        """Probe several videos in parallel."""
+        with ThreadPoolExecutor(max_workers=min(len(paths), self.MAX_PROBE_WORKERS)) as executor:
+            return list(executor.map(self._probe_file, paths))
+    
+    def _can_stream_copy(self, paths: List[str]) -> bool:
+        """Check whether all clips share codec, size, pixel format and frame rate."""
+        probes = self._probe(paths)
+        if not all(probes):
             return False
+        return all(probe == probes[0] for probe in probes[1:])
+    
+    def _run_ffmpeg(self, cmd: List[str], input_text: Optional[str] = None) -> Tuple[int, str]:
+        """
+        Run an ffmpeg command, streaming its stderr instead of buffering it.
+        
+        Only the last FFMPEG_STDERR_TAIL lines are kept for error reporting.
+        
+        Args:
+            cmd: ffmpeg command line
+            input_text: Optional text written to ffmpeg's stdin
+            
+        Returns:
+            Tuple of (return code, tail of ffmpeg's stderr)
+        """
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                                stdin=subprocess.PIPE if input_text is not None else None,
+                                stderr=subprocess.PIPE, text=True, errors='replace')
+        if input_text is not None:
+            # The concat list is small and read up front, so this can't fill the pipe
+            proc.stdin.write(input_text)
+            proc.stdin.close()
+        last_lines = deque(maxlen=self.FFMPEG_STDERR_TAIL)
+        for line in proc.stderr:
+            last_lines.append(line)
+        return proc.wait(), ''.join(last_lines)
     
     def stitch_videos(self, video_paths: List[str], output_filename: str) -> Optional[str]:
         """
@@ -51,13 +156,15 @@ class VideoStitcher:
         
         # Filter out None values and check if files exist
         valid_paths = []
+        downloader = None  # Shared so the downloads directory is only scanned once
         for v in video_paths:
             if v and os.path.exists(v):
                 valid_paths.append(v)
             elif v and (v.startswith('http://') or v.startswith('https://')):
                 # It's a URL, we'll download it first
                 print(f"Downloading video from URL: {v}")
-                downloader = VideoDownloader()
+                if downloader is None:
+                    downloader = VideoDownloader()
                 downloaded = downloader.download_video(v)
                 if downloaded:
                     valid_paths.append(downloaded)
@@ -68,65 +175,69 @@ class VideoStitcher:
         
         output_path = self.output_dir / output_filename
         
-        # Create a file list for ffmpeg concat
-        concat_file = self.output_dir / "concat_list.txt"
-        with open(concat_file, 'w') as f:
-            for video_path in valid_paths:
-                f.write(f"file '{os.path.abspath(video_path)}'\n")
+        # File list for the ffmpeg concat demuxer, piped in on stdin. Entries need
+        # an explicit file: scheme or ffmpeg resolves them relative to pipe:
+        concat_text = ''.join(f"file 'file:{os.path.abspath(video_path)}'\n" for video_path in valid_paths)
         
         try:
+            # Probe first so mismatched clips go straight to re-encoding
+            if not self._can_stream_copy(valid_paths):
+                print("Clips have different video formats, re-encoding...")
+                return self._stitch_with_reencode(valid_paths, output_path, concat_text)
+            
             # Use ffmpeg to concatenate videos
             cmd = [
                 'ffmpeg',
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', str(concat_file),
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0',
                 '-c', 'copy',  # Copy codec (fast, no re-encoding)
                 '-y',  # Overwrite output file
                 str(output_path)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, stderr_tail = self._run_ffmpeg(cmd, input_text=concat_text)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"Successfully created highlight reel: {output_path}")
-                concat_file.unlink()  # Clean up
                 return str(output_path)
             else:
                 print(f"Copy codec failed, trying with re-encoding...")
                 # Try with re-encoding if copy fails
-                return self._stitch_with_reencode(valid_paths, output_path, concat_file)
+                return self._stitch_with_reencode(valid_paths, output_path, concat_text)
                 
         except Exception as e:
             print(f"Error during video stitching: {e}")
             return None
     
     def _stitch_with_reencode(self, video_paths: List[str], output_path: Path, 
-                              concat_file: Path) -> Optional[str]:
+                              concat_text: str) -> Optional[str]:
         """Fallback method with re-encoding."""
         try:
+            encoder = self._detect_hw_encoder()
+            print(f"Re-encoding with {encoder}...")
             cmd = [
                 'ffmpeg',
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', str(concat_file),
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', '23',
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0',
+                '-c:v', encoder,
+                *self.VIDEO_ENCODER_ARGS[encoder],
                 '-c:a', 'aac',
                 '-b:a', '192k',
                 '-y',
                 str(output_path)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, stderr_tail = self._run_ffmpeg(cmd, input_text=concat_text)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"Successfully created highlight reel (with re-encoding): {output_path}")
-                concat_file.unlink()
                 return str(output_path)
             else:
-                print(f"Error stitching videos with re-encoding: {result.stderr}")
+                print(f"Error stitching videos with re-encoding: {stderr_tail}")
                 return None
                 
         except Exception as e:
@@ -137,9 +248,23 @@ class VideoStitcher:
 class VideoDownloader:
     """Downloads videos from URLs."""
     
+    # HLS/DASH segments fetched in parallel per video (NBA.com clips are mostly HLS)
+    CONCURRENT_FRAGMENTS = 8
+    
     def __init__(self, output_dir: str = "downloads"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self._finished = None  # filename stem -> finished download, scanned once
+    
+    def _find_download(self, stem: str) -> Optional[Path]:
+        """Return the finished download for a filename stem, whatever extension yt-dlp chose."""
+        if self._finished is None:
+            # .part/.ytdl leftovers have stems like "video_x.mp4", so they never match
+            self._finished = {
+                path.stem: path for path in self.output_dir.iterdir()
+                if path.is_file() and path.stat().st_size > 0
+            }
+        return self._finished.get(stem)
     
     def download_video(self, url: str, filename: Optional[str] = None) -> Optional[str]:
         """
@@ -152,28 +277,46 @@ class VideoDownloader:
         Returns:
             Path to downloaded video file, or None if download failed
         """
-        if filename is None:
-            filename = f"video_{hash(url) % 10000}.mp4"
+        # Name default downloads after the URL so reruns can reuse them
+        cached = filename is None
+        if cached:
+            filename = f"video_{hashlib.blake2b(url.encode(), digest_size=8).hexdigest()}.mp4"
         
         output_path = self.output_dir / filename
+        if cached:
+            existing = self._find_download(output_path.stem)
+            if existing:
+                print(f"Already downloaded: {existing}")
+                return str(existing)
+        
+        # Record the final filename yt-dlp writes (it may add its own extension)
+        filenames = []
+        
+        def record_filename(d):
+            if d.get('status') == 'finished':
+                filenames.append(d['filename'])
         
         ydl_opts = {
             'format': 'best[ext=mp4]/best',
-            'outtmpl': str(output_path.with_suffix('')),
+            'outtmpl': str(output_path.with_suffix('')) + '.%(ext)s',
             'quiet': False,
             'no_warnings': False,
+            'concurrent_fragment_downloads': self.CONCURRENT_FRAGMENTS,
+            'progress_hooks': [record_filename],
         }
         
         try:
+            import yt_dlp  # Deferred: slow to import and only needed for downloads
+            
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
-                
-            # Find the actual downloaded file (yt-dlp may add extension)
-            downloaded_files = list(self.output_dir.glob(f"{output_path.stem}*"))
-            if downloaded_files:
-                return str(downloaded_files[0])
             
-            return None
+            if not filenames:
+                return None
+            
+            if self._finished is not None:
+                self._finished[Path(filenames[-1]).stem] = Path(filenames[-1])
+            return filenames[-1]
             
         except Exception as e:
             print(f"Error downloading video from {url}: {e}")